@@ -2,16 +2,40 @@
 import os
 import time
 import sys
+import json
+import queue
 import signal
+import socket
 import logging
 import requests
 import threading
+import selectors
+import subprocess
 import concurrent.futures
+from collections import defaultdict, deque
+from urllib.parse import urlparse
 import paho.mqtt.client as mqtt
 import cv2
 import numpy as np
 from dotenv import load_dotenv
 
+# libjpeg-turbo (SIMD DCT/Huffman) encodes JPEGs 2-4x faster than cv2.imencode
+# and releases the GIL during the C call. Fall back to cv2 if it is missing.
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+    _TJ = TurboJPEG()
+except Exception:
+    _TJ = None
+
+# On Jetson/dGPU hosts the hardware JPEG engine encodes 1080p frames in <1ms
+# and frees the CPU for MQTT/Telegram I/O. pynvjpeg raises at init when no
+# CUDA device is present, in which case we stay on the CPU encoders.
+try:
+    from nvjpeg import NvJpeg
+    _NVJ = NvJpeg()
+except Exception:
+    _NVJ = None
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -21,6 +45,12 @@ MQTT_PORT = int(os.getenv("MQTT_PORT", 1883))
 MQTT_TOPIC = os.getenv("MQTT_TOPIC", "home/automation/camera_capture")
 MQTT_USER = os.getenv("MQTT_USER")
 MQTT_PASS = os.getenv("MQTT_PASS")
+# Optional topic prefix for publishing captured JPEGs back to the broker as
+# retained binary payloads (e.g. home/automation/camera_image -> one subtopic
+# per camera). LAN consumers like Home Assistant or Node-RED then get the
+# frame in one TCP write instead of waiting on the Telegram round trip.
+# Frames over 256KB may need the broker's max packet size raised.
+MQTT_IMAGE_TOPIC = os.getenv("MQTT_IMAGE_TOPIC", "").rstrip("/")
 
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
@@ -37,9 +67,80 @@ TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 camera_names = [name.strip() for name in os.getenv("CAMERA_NAMES", "").split(",") if name.strip()]
 IP_CAMERAS = {name: os.getenv(f"CAMERA_URL_{name.upper()}") for name in camera_names if os.getenv(f"CAMERA_URL_{name.upper()}")}
 
+# Optional per-camera tuning for bandwidth-limited uplinks:
+#   CAMERA_JPEG_Q_GARAGE=75     (JPEG quality, default 90)
+#   CAMERA_MAX_DIM_GARAGE=1280  (downscale so the longest side fits, default off)
+# Halving the resolution cuts the Telegram payload to roughly a quarter, which
+# is the biggest lever for delivery time over wifi/LTE.
+CAMERA_JPEG_QUALITY = {name: int(os.getenv(f"CAMERA_JPEG_Q_{name.upper()}", 90)) for name in IP_CAMERAS}
+CAMERA_MAX_DIM = {name: int(os.getenv(f"CAMERA_MAX_DIM_{name.upper()}", 0)) for name in IP_CAMERAS}
+
+# Low-latency FFmpeg options for the RTSP capture: TCP transport avoids packet
+# loss stalls, nobuffer/low_delay keep the internal queue short. Setting
+# FFMPEG_HWACCEL (e.g. vaapi, cuda, v4l2m2m) offloads H.264 decode to the
+# GPU/iGPU — 3-10x less CPU per frame on Pi/Intel hosts; FFmpeg falls back to
+# software decode by itself if the hwaccel cannot initialise.
+FFMPEG_HWACCEL = os.getenv("FFMPEG_HWACCEL", "").strip()
+_ffmpeg_opts = "rtsp_transport;tcp|fflags;nobuffer|flags;low_delay"
+if FFMPEG_HWACCEL:
+    _ffmpeg_opts = f"hwaccel;{FFMPEG_HWACCEL}|" + _ffmpeg_opts
+os.environ.setdefault("OPENCV_FFMPEG_CAPTURE_OPTIONS", _ffmpeg_opts)
+
+# Capture backend selection. "ffmpeg" (default) uses OpenCV's FFmpeg backend;
+# "gstreamer" builds an rtspsrc pipeline with latency=0 so the jitter buffer
+# adds no lag, and lets a hardware decoder do the H.264 work. Set GST_DECODER
+# to e.g. nvv4l2decoder (Jetson) or vaapih264dec (Intel) to offload decode;
+# requires an OpenCV build with GStreamer support. "ffmpeg-pipe" runs one
+# long-lived ffmpeg process per camera that writes MJPEG frames to stdout,
+# skipping both the per-capture handshake and the in-process JPEG encode.
+CAPTURE_BACKEND = os.getenv("CAPTURE_BACKEND", "ffmpeg").strip().lower()
+GST_DECODER = os.getenv("GST_DECODER", "avdec_h264")
+
+
+# The decoder already outputs YUV420; converting to BGR only for the JPEG
+# encoder to convert straight back wastes two full-frame passes of memory
+# bandwidth. With TurboJPEG available the GStreamer pipeline delivers raw
+# I420 planes that feed encode_from_yuv directly, skipping both conversions.
+GST_I420 = CAPTURE_BACKEND == "gstreamer" and _TJ is not None
+
+
+def build_gstreamer_pipeline(url):
+    """Build a low-latency GStreamer pipeline string for an RTSP camera."""
+    fmt = "I420" if GST_I420 else "BGR"
+    # NVIDIA decoders emit NVMM device-memory buffers that plain videoconvert
+    # cannot link against; nvvidconv copies them back to system memory first.
+    convert = "nvvidconv ! videoconvert" if GST_DECODER.startswith("nv") else "videoconvert"
+    return (
+        f"rtspsrc location={url} latency=0 protocols=tcp ! "
+        f"rtph264depay ! h264parse ! {GST_DECODER} ! "
+        f"{convert} ! video/x-raw,format={fmt} ! "
+        f"appsink drop=true max-buffers=1 sync=false"
+    )
+
 # --- Thread management ---
-executor = concurrent.futures.ThreadPoolExecutor(max_workers=3)  # Limit to 3 concurrent captures per camera
-last_captures = {}  # Tracks recent capture times (per camera) for rate limiting
+# One pool slot per camera (capped at 16): a fixed ceiling of 3 let one busy
+# camera starve the others. Per-camera single-flight is enforced separately
+# by capture_semaphores, so duplicate triggers never burn a worker
+# re-encoding the same scene.
+executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(16, max(1, len(IP_CAMERAS))))
+capture_semaphores = {name: threading.BoundedSemaphore(1) for name in IP_CAMERAS}
+# Telegram uploads block for 0.5-1s each; queueing them keeps the capture
+# workers free to serve new triggers during bursts. A single uploader thread
+# drains the queue and coalesces bursts into one sendMediaGroup call (up to
+# 10 photos per request), amortizing the HTTP round trip. The window is the
+# extra latency a lone photo may pay waiting for companions; set it to 0 to
+# only batch photos that are already queued.
+upload_queue = queue.Queue()
+UPLOAD_COALESCE_SEC = float(os.getenv("TELEGRAM_BATCH_WINDOW", 0.5))
+MEDIA_GROUP_LIMIT = 10  # Telegram's cap on items per sendMediaGroup
+# Recent capture times per camera for rate limiting: at most 3 captures per
+# 2 seconds, so a bounded deque only ever needs its oldest entry checked.
+last_captures = defaultdict(lambda: deque(maxlen=3))
+
+# MQTT client, created in main(). Module-level so the shutdown handler can
+# disconnect it — and can tell when a signal arrives before it exists, since
+# the camera warmup and stream opens run for seconds ahead of the connect.
+client = None
 
 # --- Logging Configuration ---
 logging.basicConfig(
@@ -50,54 +151,513 @@ logging.basicConfig(
 # Use 2 threads for OpenCV operations
 cv2.setNumThreads(2)
 
-# --- Function: Capture a frame using OpenCV ---
-def capture_frame_opencv(camera_name):
-    """Capture a frame from an RTSP stream using OpenCV and send it via Telegram."""
-    if camera_name not in IP_CAMERAS:
-        logging.warning(f"Unknown camera: {camera_name}")
-        return
+# Route OpenCV transform ops (resize, colour conversion) through OpenCL via
+# the T-API on hosts with an iGPU, shifting memory-bandwidth-heavy work off
+# the CPU cores. Frames are only wrapped in UMat when cv2 also does the JPEG
+# encode, since TurboJPEG/nvJPEG need host-side ndarrays and a round trip
+# through GPU memory would cost more than the resize saves.
+cv2.ocl.setUseOpenCL(True)
+_USE_OPENCL = cv2.ocl.haveOpenCL() and _TJ is None and _NVJ is None
+if _USE_OPENCL:
+    logging.info("OpenCL available: frame transforms will run on the iGPU")
 
-    url = IP_CAMERAS[camera_name]
-    start_time = time.time()
+# --- Startup warmup ---
+CAMERA_RTT_MS = {}  # camera_name -> measured RTSP round-trip time in ms
+
+DEFAULT_OPEN_TIMEOUT_MS = 3000
+
+
+def probe_camera_rtt(camera_name, url):
+    """Send a minimal RTSP OPTIONS probe and return the round-trip time in ms.
+
+    Returns None (and logs a warning) if the camera is unreachable, which
+    flags broken cameras before the first MQTT trigger arrives.
+    """
+    parsed = urlparse(url)
+    host = parsed.hostname
+    port = parsed.port or 554
+    try:
+        start = time.monotonic()
+        with socket.create_connection((host, port), timeout=2) as sock:
+            sock.settimeout(2)
+            sock.sendall(f"OPTIONS {url} RTSP/1.0\r\nCSeq: 1\r\n\r\n".encode())
+            sock.recv(1024)
+        return (time.monotonic() - start) * 1000
+    except OSError as e:
+        logging.warning("%s: RTSP warmup probe failed: %s", camera_name, e)
+        return None
+
+
+def warmup_cameras():
+    """Probe every configured camera and record its RTT before the first capture."""
+    for name, url in IP_CAMERAS.items():
+        rtt = probe_camera_rtt(name, url)
+        if rtt is not None:
+            CAMERA_RTT_MS[name] = rtt
+            logging.info("%s: RTSP reachable, RTT %.0fms", name, rtt)
+
+
+def open_timeout_ms(camera_name):
+    """Per-camera open/read timeout: 2x the measured RTT plus slack.
+
+    LAN cameras fail fast instead of waiting out the full 3s default, while
+    the clamp keeps slow links from tripping false timeouts.
+    """
+    rtt = CAMERA_RTT_MS.get(camera_name)
+    if rtt is None:
+        return DEFAULT_OPEN_TIMEOUT_MS
+    return int(min(DEFAULT_OPEN_TIMEOUT_MS, max(500, 2 * rtt + 500)))
+
+
+# --- Persistent camera streams ---
+class CaptureBackend:
+    """Common interface for the persistent per-camera capture backends.
+
+    A backend keeps one long-lived connection per camera and always holds the
+    newest frame. Subclasses implement start/stop/read; backends that produce
+    JPEG natively also override read_jpeg so the capture path can skip the
+    in-process encode.
+    """
+
+    def __init__(self, camera_name, url):
+        self.camera_name = camera_name
+        self.url = url
+        self.stopped = False
+
+    def start(self):
+        """Open the stream and begin buffering frames in the background."""
+        raise NotImplementedError
+
+    def stop(self):
+        """Tear down the stream and any background machinery."""
+        raise NotImplementedError
+
+    def read(self):
+        """Return the newest frame as a BGR ndarray, or None if unavailable."""
+        raise NotImplementedError
+
+    def read_jpeg(self):
+        """Return the newest frame as ready-encoded JPEG bytes, or None.
+
+        The default is None, meaning the caller should read() the decoded
+        frame and encode it with encode_jpeg.
+        """
+        return None
+
+
+class CameraStream(CaptureBackend):
+    """Keep a long-lived RTSP connection to one camera and always hold the newest frame.
+
+    A background thread continuously grab()s frames into the decoder, so a capture
+    request only needs a retrieve() — no RTSP handshake, codec probe, or keyframe
+    wait on the hot path. If the stream dies (consecutive grab failures), the
+    thread reopens it automatically.
+    """
+
+    MAX_GRAB_FAILURES = 25  # Consecutive failures before forcing a reopen
+    REOPEN_DELAY_SEC = 2    # Back-off between reopen attempts
+
+    def __init__(self, camera_name, url):
+        super().__init__(camera_name, url)
+        self.cap = None
+        self.lock = threading.Lock()  # Guards grab/retrieve on the shared cap
+        self.thread = threading.Thread(target=self._reader, daemon=True,
+                                       name=f"camera-{camera_name}")
+
+    def start(self):
+        """Open the stream and start the background grab loop."""
+        self._open()
+        self.thread.start()
+
+    def stop(self):
+        """Stop the grab loop and release the capture."""
+        self.stopped = True
+        with self.lock:
+            if self.cap is not None:
+                self.cap.release()
+                self.cap = None
+
+    def _open(self):
+        if CAPTURE_BACKEND == "gstreamer":
+            cap = cv2.VideoCapture(build_gstreamer_pipeline(self.url), cv2.CAP_GSTREAMER)
+        else:
+            # The constructor performs the open, so the timeouts must be
+            # passed as params here; set() afterwards would only apply to a
+            # later open() that never happens.
+            timeout_ms = open_timeout_ms(self.camera_name)
+            cap = cv2.VideoCapture(self.url, cv2.CAP_FFMPEG,
+                                   [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, timeout_ms,
+                                    cv2.CAP_PROP_READ_TIMEOUT_MSEC, timeout_ms])
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        if cap.isOpened():
+            logging.info("Opened persistent RTSP stream for %s", self.camera_name)
+        else:
+            logging.error("Failed to open RTSP stream: %s", self.url)
+        with self.lock:
+            if self.cap is not None:
+                self.cap.release()
+            self.cap = cap
+
+    def _reader(self):
+        """Continuously grab frames so retrieve() always returns the newest one."""
+        failures = 0
+        while not self.stopped:
+            with self.lock:
+                ok = self.cap is not None and self.cap.isOpened() and self.cap.grab()
+            if ok:
+                failures = 0
+                continue
+            failures += 1
+            if failures >= self.MAX_GRAB_FAILURES:
+                logging.warning("%s: %d consecutive grab failures, reopening stream", self.camera_name, failures)
+                self._open()
+                failures = 0
+            time.sleep(self.REOPEN_DELAY_SEC / self.MAX_GRAB_FAILURES)
+
+    def _retrieve(self):
+        with self.lock:
+            if self.cap is None or not self.cap.isOpened():
+                return None
+            ret, frame = self.cap.retrieve()
+        return frame if ret else None
+
+    def read(self):
+        """Return the most recently grabbed frame as BGR, or None if unavailable."""
+        frame = self._retrieve()
+        if frame is not None and GST_I420:
+            frame = cv2.cvtColor(frame, cv2.COLOR_YUV2BGR_I420)
+        return frame
+
+    def read_jpeg(self):
+        """Return the newest frame as ready-encoded JPEG bytes, or None.
+
+        In I420 mode the raw YUV planes from the appsink go straight into
+        libjpeg-turbo, avoiding the YUV->BGR->YUV round trip. Otherwise the
+        frame is decoded BGR and encoding happens in encode_jpeg.
+        """
+        if not GST_I420 or CAMERA_MAX_DIM.get(self.camera_name, 0):
+            # Downscaling needs the decoded BGR frame, so a max-dim cap
+            # routes through read() + encode_jpeg instead.
+            return None
+        raw = self._retrieve()  # (height*3/2, width) stacked I420 planes
+        if raw is None:
+            return None
+        height = raw.shape[0] * 2 // 3
+        try:
+            return _TJ.encode_from_yuv(raw, height, raw.shape[1],
+                                       quality=CAMERA_JPEG_QUALITY.get(self.camera_name, 90),
+                                       jpeg_subsample=TJSAMP_420)
+        except Exception as e:
+            logging.error("TurboJPEG YUV encode failed: %s", e)
+            return None
+
+
+class _FFmpegPipeReader:
+    """Single selectors-based loop demultiplexing every ffmpeg stdout pipe.
+
+    One thread blocking per camera wastes a kernel stack each and scales
+    poorly; instead all pipes register with one selector and a single thread
+    feeds whichever stream has data ready.
+    """
+
+    def __init__(self):
+        self.selector = selectors.DefaultSelector()
+        self.lock = threading.Lock()
+        self.started = False
+        self.thread = threading.Thread(target=self._loop, daemon=True,
+                                       name="ffmpeg-pipe-reader")
+
+    def register(self, stream):
+        """Start demultiplexing a stream's ffmpeg stdout."""
+        os.set_blocking(stream.proc.stdout.fileno(), False)
+        with self.lock:
+            self.selector.register(stream.proc.stdout, selectors.EVENT_READ, stream)
+            if not self.started:
+                self.started = True
+                self.thread.start()
+
+    def unregister(self, fileobj):
+        with self.lock:
+            try:
+                self.selector.unregister(fileobj)
+            except KeyError:
+                pass
+
+    def _loop(self):
+        while True:
+            for key, _ in self.selector.select(timeout=1):
+                stream = key.data
+                chunk = key.fileobj.read(65536)
+                if chunk:
+                    stream._feed(chunk)
+                elif chunk is not None:  # b"" means EOF: ffmpeg exited
+                    self.unregister(key.fileobj)
+                    stream._on_pipe_closed()
 
-    logging.info(f"Attempting to capture frame from: {url}")
-    cap = cv2.VideoCapture(url)
-    if not cap.isOpened():
-        logging.error(f"Failed to open RTSP stream: {url}")
-        send_telegram_message(f"🚨 RTSP ERROR: {camera_name} failed to open stream")
-        return
 
-    # Set timeouts and reduce buffering for faster capture
-    cap.set(cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, 3000)
-    cap.set(cv2.CAP_PROP_READ_TIMEOUT_MSEC, 3000)
-    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+_PIPE_READER = _FFmpegPipeReader()
 
-    # Use grab/retrieve to minimize decoding overhead
-    cap.grab()
-    ret, frame = cap.retrieve()
-    cap.release()
 
+class FFmpegPipeStream(CaptureBackend):
+    """Persistent ffmpeg process that streams MJPEG frames for one camera.
+
+    ffmpeg holds the RTSP session open and writes JPEG frames to stdout; the
+    shared pipe reader scans for SOI/EOI markers and keeps the most recent
+    complete frame in a one-slot buffer. A capture request just takes that
+    JPEG — no handshake, no decode, no re-encode in this process. If ffmpeg
+    exits, the stream respawns it after a short back-off.
+    """
+
+    SOI = b"\xff\xd8"  # JPEG start-of-image marker
+    EOI = b"\xff\xd9"  # JPEG end-of-image marker
+    RESPAWN_DELAY_SEC = 2
+
+    def __init__(self, camera_name, url):
+        super().__init__(camera_name, url)
+        self.proc = None
+        self.buf = bytearray()  # Partial stdout data, owned by the pipe reader
+        self.lock = threading.Lock()  # Guards the one-slot latest-frame buffer
+        self.latest = None
+
+    def start(self):
+        """Spawn ffmpeg and register with the shared pipe reader.
+
+        A failed spawn (missing binary, resource limits) is retried on the
+        respawn back-off instead of taking down startup.
+        """
+        self._respawn()
+
+    def stop(self):
+        """Stop demultiplexing and terminate ffmpeg."""
+        self.stopped = True
+        if self.proc is not None:
+            _PIPE_READER.unregister(self.proc.stdout)
+            self.proc.kill()
+
+    def _spawn(self):
+        """Start the ffmpeg process; returns False (and logs) on failure."""
+        cmd = ["ffmpeg", "-rtsp_transport", "tcp", "-fflags", "nobuffer",
+               "-flags", "low_delay"]
+        if FFMPEG_HWACCEL:
+            cmd += ["-hwaccel", FFMPEG_HWACCEL]
+        # mjpeg -q:v runs 2 (best) to 31; map the 1-100 JPEG quality scale
+        # onto it so the default of 90 keeps the previous -q:v 3.
+        quality = CAMERA_JPEG_QUALITY.get(self.camera_name, 90)
+        qv = max(2, min(31, round((100 - quality) / 3.3)))
+        cmd += ["-i", self.url, "-f", "image2pipe", "-vcodec", "mjpeg",
+                "-q:v", str(qv)]
+        max_dim = CAMERA_MAX_DIM.get(self.camera_name, 0)
+        if max_dim:
+            # Downscale in ffmpeg since the JPEG never decodes in-process;
+            # -2 keeps the height even for the encoder.
+            cmd += ["-vf", f"scale='min({max_dim},iw)':-2"]
+        cmd += ["-"]
+        try:
+            self.proc = subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=0)
+        except OSError as e:
+            logging.error("%s: failed to spawn ffmpeg: %s", self.camera_name, e)
+            self.proc = None
+            return False
+        logging.info("Spawned persistent ffmpeg pipe for %s", self.camera_name)
+        return True
+
+    def _feed(self, chunk):
+        """Consume a chunk of ffmpeg stdout (called from the pipe reader)."""
+        self.buf += chunk
+        self._extract_frames(self.buf)
+
+    def _on_pipe_closed(self):
+        """Schedule a respawn after ffmpeg exits (called from the pipe reader)."""
+        if self.stopped:
+            return
+        logging.warning("%s: ffmpeg pipe closed, respawning", self.camera_name)
+        self.buf.clear()
+        # Timer instead of sleeping, so the shared loop keeps serving pipes.
+        threading.Timer(self.RESPAWN_DELAY_SEC, self._respawn).start()
+
+    def _respawn(self):
+        if self.stopped:
+            return
+        if not self._spawn():
+            # Keep retrying on the back-off; one failed spawn must not leave
+            # the camera dead with no watchdog.
+            threading.Timer(self.RESPAWN_DELAY_SEC, self._respawn).start()
+            return
+        _PIPE_READER.register(self)
+
+    def _extract_frames(self, buf):
+        """Pull every complete SOI..EOI frame out of buf, keeping the last."""
+        while True:
+            start = buf.find(self.SOI)
+            if start < 0:
+                buf.clear()
+                return
+            end = buf.find(self.EOI, start + 2)
+            if end < 0:
+                del buf[:start]  # Drop garbage before the partial frame
+                return
+            # Slicing the bytearray would copy once into a bytearray and
+            # bytes() again; going through a memoryview copies exactly once.
+            frame = bytes(memoryview(buf)[start:end + 2])
+            del buf[:end + 2]
+            with self.lock:
+                self.latest = frame
+
+    def read(self):
+        """Return the newest frame decoded to a BGR ndarray, or None."""
+        jpeg = self.read_jpeg()
+        if jpeg is None:
+            return None
+        return cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+    def read_jpeg(self):
+        """Return the newest complete JPEG frame, or None if not yet available."""
+        with self.lock:
+            return self.latest
+
+
+CAMERA_STREAMS = {}  # camera_name -> stream backend, populated at startup
+
+
+# The OpenCV-based CameraStream serves both the ffmpeg and gstreamer backends;
+# the pipeline it opens is decided by CAPTURE_BACKEND in _open().
+CAPTURE_BACKENDS = {
+    "ffmpeg": CameraStream,
+    "gstreamer": CameraStream,
+    "ffmpeg-pipe": FFmpegPipeStream,
+}
+
+
+def init_camera_streams():
+    """Open a persistent stream for every configured camera."""
+    stream_cls = CAPTURE_BACKENDS.get(CAPTURE_BACKEND, CameraStream)
+    for name, url in IP_CAMERAS.items():
+        stream = stream_cls(name, url)
+        stream.start()
+        CAMERA_STREAMS[name] = stream
+
+
+# --- JPEG encoding ---
+# Built once; rebuilding the param list on every encode is free to avoid.
+_JPEG_PARAMS = (int(cv2.IMWRITE_JPEG_QUALITY), 90)
+
+
+def encode_jpeg(frame, quality=90):
+    """Encode a BGR frame as JPEG bytes, or None on failure.
+
+    Prefers the GPU hardware JPEG engine (nvJPEG) when present, then
+    libjpeg-turbo (returns bytes directly, no extra copy), and finally
+    falls back to cv2.imencode.
+    """
+    global _NVJ
+    if _NVJ is not None:
+        try:
+            return _NVJ.encode(frame, quality)
+        except Exception as e:
+            # A failed GPU encode (lost context, OOM) should not cost us the
+            # frame — drop to the CPU path and stop trying the GPU.
+            logging.error("nvJPEG encode failed, falling back to CPU: %s", e)
+            _NVJ = None
+    if _TJ is not None:
+        try:
+            return _TJ.encode(frame, quality=quality, pixel_format=TJPF_BGR,
+                              jpeg_subsample=TJSAMP_420)
+        except Exception as e:
+            logging.error("TurboJPEG encode failed: %s", e)
+            return None
+    params = _JPEG_PARAMS if quality == 90 else (int(cv2.IMWRITE_JPEG_QUALITY), quality)
+    ret, im_buf_arr = cv2.imencode(".jpg", frame, params)
     if not ret:
-        logging.error(f"Failed to grab frame from {camera_name}")
-        send_telegram_message(f"🚨 RTSP ERROR: {camera_name} failed to grab frame")
-        return
+        return None
+    # The encoded ndarray already owns the JPEG bytes; hand out its buffer
+    # directly instead of duplicating it with tobytes(). requests streams
+    # any bytes-like object into the multipart body without another copy.
+    return im_buf_arr.data
+
 
-    # Encode frame as JPEG in memory
-    encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), 90]
-    ret2, im_buf_arr = cv2.imencode(".jpg", frame, encode_param)
-    if not ret2:
-        logging.error(f"Failed to encode image for {camera_name}")
-        send_telegram_message(f"🚨 ERROR: {camera_name} failed to encode frame")
+# --- Function: Capture a frame using OpenCV ---
+def capture_frame_opencv(camera_name):
+    """Capture a frame from the camera's persistent stream and send it via Telegram.
+
+    At most one capture per camera runs at a time; extra triggers that arrive
+    while one is in flight are dropped rather than queued, since they would
+    only re-encode the same scene.
+    """
+    stream = CAMERA_STREAMS.get(camera_name)
+    if stream is None:
+        logging.warning("Unknown camera: %s", camera_name)
         return
 
-    image_bytes = im_buf_arr.tobytes()
-    capture_time = round(time.time() - start_time, 2)
-    logging.info(f"Sending image to Telegram (Captured in {capture_time}s)")
-    send_telegram_photo(image_bytes, f"📷 {camera_name} captured in {capture_time} secs")
+    sem = capture_semaphores[camera_name]
+    if not sem.acquire(blocking=False):
+        logging.info("Skipping %s (capture already in flight)", camera_name)
+        return
+    try:
+        _capture_and_send(camera_name, stream)
+    finally:
+        sem.release()
+
+
+def _capture_and_send(camera_name, stream):
+    """Grab the newest frame, encode it, and dispatch it to the sinks."""
+    start_time = time.monotonic()
+    logging.info("Retrieving latest frame from: %s", camera_name)
+
+    # The ffmpeg-pipe backend hands over a ready-encoded JPEG; the OpenCV
+    # backends return a decoded frame that still needs encoding here.
+    image_bytes = stream.read_jpeg()
+    if image_bytes is None:
+        frame = stream.read()
+        if frame is None:
+            logging.error("Failed to grab frame from %s", camera_name)
+            send_telegram_message(f"🚨 RTSP ERROR: {camera_name} failed to grab frame")
+            return
+
+        # Downscale oversized frames before encoding; INTER_AREA averages
+        # source pixels, which keeps quality high when shrinking.
+        max_dim = CAMERA_MAX_DIM.get(camera_name, 0)
+        if max_dim and max(frame.shape[:2]) > max_dim:
+            scale = max_dim / max(frame.shape[:2])
+            new_size = (int(frame.shape[1] * scale), int(frame.shape[0] * scale))
+            if _USE_OPENCL:
+                # Keep the frame GPU-side through resize and encode; only the
+                # encoded JPEG buffer comes back to the CPU.
+                frame = cv2.UMat(frame)
+            frame = cv2.resize(frame, new_size, interpolation=cv2.INTER_AREA)
+
+        # Encode frame as JPEG in memory
+        image_bytes = encode_jpeg(frame, CAMERA_JPEG_QUALITY.get(camera_name, 90))
+        if image_bytes is None:
+            logging.error("Failed to encode image for %s", camera_name)
+            send_telegram_message(f"🚨 ERROR: {camera_name} failed to encode frame")
+            return
+
+    # Publish to MQTT first: the connection is already open, so LAN consumers
+    # see the frame within milliseconds regardless of Telegram API latency.
+    if MQTT_IMAGE_TOPIC:
+        payload = image_bytes if isinstance(image_bytes, (bytes, bytearray)) else bytes(image_bytes)
+        client.publish(f"{MQTT_IMAGE_TOPIC}/{camera_name}", payload, qos=0, retain=True)
+
+    capture_time = round(time.monotonic() - start_time, 2)
+    logging.info("Sending image to Telegram (Captured in %ss)", capture_time)
+    # Queue the upload so this capture worker returns at once; the uploader
+    # thread batches bursts into a single media-group request.
+    upload_queue.put((image_bytes, f"📷 {camera_name} captured in {capture_time} secs"))
 
 # --- Telegram Integration Functions ---
+# One shared Session keeps the TCP+TLS connection to api.telegram.org alive
+# across uploads; the handshake alone costs ~150-300ms per request otherwise.
+_TG = requests.Session()
+_TG.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+
 def send_telegram_photo(image_bytes, caption=""):
-    """Send an image to Telegram."""
+    """Send an image to Telegram.
+
+    Accepts any bytes-like object (bytes, memoryview, ndarray buffer);
+    requests streams it into the multipart body without copying.
+    """
     if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
         logging.warning("Telegram bot is disabled (No Token/Chat ID).")
         return
@@ -108,13 +668,66 @@ def send_telegram_photo(image_bytes, caption=""):
 
     logging.info("Sending image to Telegram API now...")
     try:
-        response = requests.post(url, files=files, data=data, timeout=10)
+        response = _TG.post(url, files=files, data=data, timeout=10)
         if response.status_code == 200:
             logging.info("Telegram API acknowledged message successfully")
         else:
-            logging.error(f"Telegram API Error: {response.text}")
+            logging.error("Telegram API Error: %s", response.text)
+    except Exception as e:
+        logging.error("Error sending Telegram photo: %s", e)
+
+def send_telegram_media_group(items):
+    """Send several photos in a single sendMediaGroup request.
+
+    items is a list of (image_bytes, caption) pairs, at most MEDIA_GROUP_LIMIT.
+    One multipart POST carries all of them, so a burst pays the HTTP round
+    trip once instead of per photo.
+    """
+    if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
+        logging.warning("Telegram bot is disabled (No Token/Chat ID).")
+        return
+
+    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMediaGroup"
+    media = []
+    files = {}
+    for i, (image_bytes, caption) in enumerate(items):
+        name = f"photo{i}"
+        media.append({"type": "photo", "media": f"attach://{name}", "caption": caption})
+        files[name] = (f"{name}.jpg", image_bytes, "image/jpeg")
+    data = {"chat_id": TELEGRAM_CHAT_ID, "media": json.dumps(media)}
+
+    logging.info("Sending %d images to Telegram as a media group...", len(items))
+    try:
+        response = _TG.post(url, files=files, data=data, timeout=15)
+        if response.status_code == 200:
+            logging.info("Telegram API acknowledged media group successfully")
+        else:
+            logging.error("Telegram API Error: %s", response.text)
     except Exception as e:
-        logging.error(f"Error sending Telegram photo: {e}")
+        logging.error("Error sending Telegram media group: %s", e)
+
+
+def telegram_uploader():
+    """Drain the upload queue forever, batching bursts into media groups."""
+    while True:
+        items = [upload_queue.get()]
+        deadline = time.monotonic() + UPLOAD_COALESCE_SEC
+        while len(items) < MEDIA_GROUP_LIMIT:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    items.append(upload_queue.get(timeout=remaining))
+                else:
+                    items.append(upload_queue.get_nowait())
+            except queue.Empty:
+                break
+        if len(items) == 1:
+            send_telegram_photo(*items[0])
+        else:
+            send_telegram_media_group(items)
+        for _ in items:
+            upload_queue.task_done()
+
 
 def send_telegram_message(text):
     """Send a text message to Telegram."""
@@ -123,9 +736,9 @@ def send_telegram_message(text):
     url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
     data = {"chat_id": TELEGRAM_CHAT_ID, "text": text}
     try:
-        requests.post(url, data=data, timeout=10)
+        _TG.post(url, data=data, timeout=10)
     except Exception as e:
-        logging.error(f"Error sending Telegram message: {e}")
+        logging.error("Error sending Telegram message: %s", e)
 
 # --- MQTT Event Handlers ---
 def on_connect(client, userdata, flags, rc, properties=None):
@@ -134,11 +747,11 @@ def on_connect(client, userdata, flags, rc, properties=None):
     Subscribes to the configured MQTT topic upon successful connection.
     """
     if rc == 0:
-        logging.info(f"Connected to MQTT Broker: {MQTT_BROKER}:{MQTT_PORT}")
+        logging.info("Connected to MQTT Broker: %s:%s", MQTT_BROKER, MQTT_PORT)
         client.subscribe(MQTT_TOPIC)
-        logging.info(f"Subscribed to MQTT topic: {MQTT_TOPIC}")
+        logging.info("Subscribed to MQTT topic: %s", MQTT_TOPIC)
     else:
-        logging.error(f"MQTT connection failed with code {rc}")
+        logging.error("MQTT connection failed with code %s", rc)
 
 def on_message(client, userdata, msg):
     """Handle incoming MQTT messages and process capture requests.
@@ -148,27 +761,31 @@ def on_message(client, userdata, msg):
     """
     camera_name = msg.payload.decode("utf-8").strip()
     if camera_name not in IP_CAMERAS:
-        logging.warning(f"Unknown camera received: {camera_name}")
+        logging.warning("Unknown camera received: %s", camera_name)
         return
 
-    now = time.time()
-    last_captures.setdefault(camera_name, [])
-    # Keep only captures within the last 2 seconds
-    last_captures[camera_name] = [t for t in last_captures[camera_name] if now - t < 2]
-    if len(last_captures[camera_name]) >= 3:
-        logging.info(f"Skipping {camera_name} (Already 3 captures in 2 sec)")
+    now = time.monotonic()
+    recent = last_captures[camera_name]
+    # With maxlen=3 the deque holds the last 3 capture times; if the oldest is
+    # still within the 2-second window, a 4th capture would exceed the limit.
+    if len(recent) == 3 and now - recent[0] < 2:
+        logging.info("Skipping %s (Already 3 captures in 2 sec)", camera_name)
         return
 
-    last_captures[camera_name].append(now)
-    logging.info(f"Received MQTT request for: {camera_name}")
+    recent.append(now)
+    logging.info("Received MQTT request for: %s", camera_name)
     executor.submit(capture_frame_opencv, camera_name)
 
 # --- Graceful Shutdown Handler ---
 def graceful_shutdown(signum, frame):
     """Handles graceful shutdown on receiving termination signals."""
-    logging.info(f"Received signal {signum}. Initiating graceful shutdown...")
-    client.disconnect()  # Disconnect from MQTT broker
+    logging.info("Received signal %s. Initiating graceful shutdown...", signum)
+    if client is not None:
+        client.disconnect()  # Disconnect from MQTT broker
     executor.shutdown(wait=True)
+    upload_queue.join()  # Let queued uploads finish
+    for stream in CAMERA_STREAMS.values():
+        stream.stop()
     sys.exit(0)
 
 # --- Main Application Entry Point ---
@@ -181,6 +798,14 @@ def main():
     signal.signal(signal.SIGINT, graceful_shutdown)
     signal.signal(signal.SIGTERM, graceful_shutdown)
 
+    # Probe cameras (warms the TCP path, sizes open timeouts from measured
+    # RTT) and open persistent RTSP streams before accepting triggers, so the
+    # first capture is as fast as steady-state.
+    warmup_cameras()
+    init_camera_streams()
+    threading.Thread(target=telegram_uploader, daemon=True,
+                     name="telegram-uploader").start()
+
     global client  # Make client accessible in the shutdown handler
     client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
     client.on_connect = on_connect